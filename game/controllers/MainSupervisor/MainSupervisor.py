@@ -622,10 +622,14 @@ while simulationRunning:
     r0 = False
     r1 = False
 
+    # Get the robot positions once for this frame (each read is a call into Webots)
+    robot0Pos = robot0Obj.position if robot0Obj.inSimulation else None
+    robot1Pos = robot1Obj.position if robot1Obj.inSimulation else None
+
     # Test if the robots are in bases
     for checkpoint in checkpoints:
         if robot0Obj.inSimulation:
-            if checkpoint.checkPosition(robot0Obj.position):
+            if checkpoint.checkPosition(robot0Pos):
                 r0 = True
                 robot0Obj.lastVisitedCheckPointPosition = checkpoint.center
 
@@ -643,7 +647,7 @@ while simulationRunning:
                     updateHistory()
 
         if robot1Obj.inSimulation:
-            if checkpoint.checkPosition(robot1Obj.position):
+            if checkpoint.checkPosition(robot1Pos):
                 r1 = True
                 robot1Obj.lastVisitedCheckPointPosition = checkpoint.center
 
@@ -684,11 +688,11 @@ while simulationRunning:
     # Check if the robots are in swamps
     for swamp in swamps:
         if robot0Obj.inSimulation:
-            if swamp.checkPosition(robot0Obj.position):
+            if swamp.checkPosition(robot0Pos):
                 r0s = True
 
         if robot1Obj.inSimulation:
-            if swamp.checkPosition(robot1Obj.position):
+            if swamp.checkPosition(robot1Pos):
                 r1s = True
 
     # #Print when robot0 enters or exits a checkpoint
@@ -755,7 +759,7 @@ while simulationRunning:
 
                 robot0Obj.message = []
 
-                if robot0Obj.startingTile.checkPosition(robot0Obj.position):
+                if robot0Obj.startingTile.checkPosition(robot0Pos):
                     #print("Robot 0 Successful Exit")
 
                     robot0Obj.history.enqueue("Successful Exit")
@@ -779,7 +783,7 @@ while simulationRunning:
 
                 robot1Obj.message = []
 
-                if robot1Obj.startingTile.checkPosition(robot1Obj.position):
+                if robot1Obj.startingTile.checkPosition(robot1Pos):
                     #print("Robot 1 Successful Exit")
 
                     robot1Obj.history.enqueue("Successful Exit")
@@ -806,9 +810,9 @@ while simulationRunning:
 
                 for i, h in enumerate(humans):
                     if not h.identified:
-                        if h.checkPosition(robot0Obj.position, 0.15):
+                        if h.checkPosition(robot0Pos, 0.15):
                             if h.checkPosition(r0_est_vic_pos, 0.15):
-                                    if h.onSameSide(robot0Obj.position):
+                                    if h.onSameSide(robot0Pos):
         
                                         #print("Robot 0 Successful Victim Identification")
 
@@ -842,9 +846,9 @@ while simulationRunning:
 
                 for i, h in enumerate(humans):
                     if not h.identified:
-                        if h.checkPosition(robot1Obj.position, 0.15):
+                        if h.checkPosition(robot1Pos, 0.15):
                             if h.checkPosition(r1_est_vic_pos, 0.15):
-                                    if h.onSameSide(robot1Obj.position):
+                                    if h.onSameSide(robot1Pos):
         
                                         #print("Robot 1 Successful Victim Identification")
 
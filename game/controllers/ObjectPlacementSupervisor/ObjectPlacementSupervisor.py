@@ -1,4 +1,4 @@
-"""Object Placing Supervisor Prototype v7
+"""Object Placing Supervisor Prototype v8
    Written by Robbie Goldman and Alfred Roberts
 
 Features:
@@ -22,14 +22,27 @@ Changelog:
  - Activities placed before obstacles
  V7
  - Adjusted radius calculations so they are the correct size not double
+ V8
+ - Placement only checks nearby items when many have been placed
+ - Intersection checks stop at the first hit and compare squared distances
+ - Placed items are flattened once per placement with their squared limits precomputed
+ - Room size boundaries are only calculated once per placement
+ - Blocked rooms are checked with a set
+ - Obstacle and activity sizes and radii use shared helpers
+ - Positions are picked with uniform from a single random generator (no longer rounded to the cm)
+ - Human bounds are only retrieved once
 """
 
 from controller import Supervisor
 import random
+import math
 
 #Create the instance of the supervisor class
 supervisor = Supervisor()
 
+#Random number generator used for placement
+_rng = random.Random()
+
 #Get field to output information to
 outputField = supervisor.getFromDef("OBJECTPLACER").getField("customData")
 
@@ -124,21 +137,27 @@ def determineRoom(roomList: list, objectPosition: list) -> int:
     return -1
 
     
+def getAllSizes (defName: str, number: int) -> list:
+    '''Returns a list of the x y and z scales of the numbered box geometries with the given DEF name'''
+    #List to hold all the scales
+    sizes = []
+
+    #Iterate for the boxes
+    for boxNumber in range(0, number):
+        #Get the scale from the box geometry and add it to the list
+        sizes.append(supervisor.getFromDef(defName + str(boxNumber)).getField("size").getSFVec3f())
+
+    return sizes
+
+
+def getRadius (scale: list) -> float:
+    '''Returns the radius of the circle that encloses an object of the given x y and z scale'''
+    return math.hypot(scale[0] * 0.5, scale[2] * 0.5)
+
+    
 def getAllObstacles(numberObstacles: int) -> list:
     '''Returns a list of all the obstacles in the world, each obstacle is a 1D array of it's x y and z scale'''
-    #List to hold all obstacles
-    obstacles = []
-    
-    #Iterate for obstacles
-    for obstacleNumber in range(0, numberObstacles):
-        #Obtain the object for the obstacle
-        obstacleBoxObj = supervisor.getFromDef("OBSTACLEBOX" + str(obstacleNumber))
-        #Get the obstacles scale
-        scale = obstacleBoxObj.getField("size").getSFVec3f()
-        #Add to list of obstacles
-        obstacles.append(scale)
-    
-    return obstacles
+    return getAllSizes("OBSTACLEBOX", numberObstacles)
     
     
 def getAllBases(numberBases, baseNodes) -> list:
@@ -162,99 +181,126 @@ def getAllBases(numberBases, baseNodes) -> list:
 def getAllActivities(numActivityBoxes: int, numActivityPads: int) -> list:
     '''Returns a list containing all the boxes and all the pads and a list containing all the scales'''
     #Lists to contain all boxes and pads
-    activityObjects = []
-    activitySizes = []
+    activityObjects = [supervisor.getFromDef("ACT" + str(boxNum)) for boxNum in range(0, numActivityBoxes)]
+    activityObjects.extend(supervisor.getFromDef("ACT" + str(padNum) + "MAT") for padNum in range(0, numActivityPads))
+    activitySizes = getAllSizes("ACTIVITYBOX", numActivityBoxes) + getAllSizes("ACTIVITYPAD", numActivityPads)
     #Which box is connected to which pad
-    associations = []
-
-    #Iterate for box IDs
-    for boxNum in range(0, numActivityBoxes):
-        #Add the box to the list
-        activityObjects.append(supervisor.getFromDef("ACT" + str(boxNum)))
-        activitySizes.append(supervisor.getFromDef("ACTIVITYBOX" + str(boxNum)).getField("size").getSFVec3f())
-        associations.append(boxNum)
-        
-    #Iterate for pad IDs
-    for padNum in range(0, numActivityPads):
-        #Add the pad to the list
-        activityObjects.append(supervisor.getFromDef("ACT" + str(padNum) + "MAT"))
-        activitySizes.append(supervisor.getFromDef("ACTIVITYPAD" + str(padNum)).getField("size").getSFVec3f())
-        associations.append(padNum)
+    associations = list(range(0, numActivityBoxes)) + list(range(0, numActivityPads))
         
     #Return the full object list and size list
     return activityObjects, activitySizes, associations
-    
-    
-def generatePosition(radius: int, rooms: list, blockedRooms: list, usedSpaces: list, forced = False):
+
+
+def buildSpaceGrid (spaces: list, cellSize: float) -> dict:
+    '''Returns a dictionary of grid cells to the items (as x, z, limit tuples) with their centre in that cell'''
+    #Grid of cells - each containing a list of items
+    grid = {}
+
+    #Iterate through the placed items
+    for item in spaces:
+        #Add the item to the cell containing its centre
+        cell = (math.floor(item[0] / cellSize), math.floor(item[1] / cellSize))
+        grid.setdefault(cell, []).append(item)
+
+    return grid
+
+
+def getNearbySpaces (spaceGrid: dict, cellSize: float, x: float, z: float) -> list:
+    '''Returns the placed items in the grid cell containing the position and the 8 cells around it'''
+    #Get the cell containing the position
+    cellX = math.floor(x / cellSize)
+    cellZ = math.floor(z / cellSize)
+
+    nearby = []
+
+    #Iterate through the 3 by 3 block of cells
+    for offsetX in (-1, 0, 1):
+        for offsetZ in (-1, 0, 1):
+            nearby.extend(spaceGrid.get((cellX + offsetX, cellZ + offsetZ), []))
+
+    return nearby
+
+
+def _trySample (bounds: tuple, spaces: list, spaceGrid: dict, cellSize: float):
+    '''Returns a random x and z position within the bounds that does not intersect a placed item (or None if it does)'''
+    xMin, xMax, zMin, zMax = bounds
+
+    #If the object is too big for the room it cannot be placed here
+    if xMin >= xMax or zMin >= zMax:
+        return None
+
+    #Get a random x and z position between min and max
+    randomX = _rng.uniform(xMin, xMax)
+    randomZ = _rng.uniform(zMin, zMax)
+
+    #Items that could intersect the position (all of them if there is no grid)
+    nearbySpaces = spaces
+    if spaceGrid is not None:
+        nearbySpaces = getNearbySpaces(spaceGrid, cellSize, randomX, randomZ)
+
+    #Iterate through the placed items
+    for itemX, itemZ, limit in nearbySpaces:
+        #If the distance is less than the two radii added together (compared squared to avoid a square root)
+        if ((randomX - itemX) ** 2) + ((randomZ - itemZ) ** 2) <= limit:
+            #It intersects a placed object and cannot be placed here
+            return None
+
+    return randomX, randomZ
+
+
+def generatePosition(radius: int, rooms: list, blockedRooms, usedSpaces: list, forced = False):
     '''Returns a random x and z position within the area, that is valid'''
     #Round the radius to 2dp
     radius = round(float(radius), 2)
 
+    #Set of rooms that cannot be used (for constant time lookup)
+    blocked = set(blockedRooms)
     #List to contain rooms that may be generated
-    validRoomIds = []
-    #Iterate through all the rooms
-    for index in range(0, len(rooms)):
-        #If the room is allowed then add it to the list
-        if index not in blockedRooms:
-            validRoomIds.append(index)
-
-    selectedRoomId = -1
-    
-    #Not yet ready to be added
-    done = False
+    validRoomIds = [index for index in range(0, len(rooms)) if index not in blocked]
+
+    #Flatten the placed items to x, z and the squared distance that must be exceeded (radius is fixed for this call)
+    spaces = [(item[0][0], item[0][1], (radius + item[1]) * (radius + item[1])) for item in usedSpaces]
 
-    #Initial values
-    randomX = 0
-    randomZ = 0
+    #Only use a grid when there are enough placed items to make it worthwhile
+    spaceGrid = None
+    cellSize = 0
+    if len(spaces) >= 32:
+        #Cells are large enough that any intersecting item has its centre in a neighbouring cell
+        cellSize = max(radius + max(item[1] for item in usedSpaces), 0.01)
+        spaceGrid = buildSpaceGrid(spaces, cellSize)
+
+    #Size boundaries of each room that has been selected, indexed by room id
+    roomBounds = {}
 
     #Limited number of attempts
     attempts = 100
 
     #Repeat until a valid position is found (or attempts exhausted (unless overridden))
-    while not done and (attempts > 0 or forced):
-
-        done = True
-
-        selectedRoomId = validRoomIds[random.randrange(0, len(validRoomIds))]
-        selectedRoom = rooms[selectedRoomId]
-
-        roomMin = [selectedRoom[0][0], selectedRoom[0][1]]
-        roomMax = [selectedRoom[1][0], selectedRoom[1][1]]
-
-        #Calculate size boundaries
-        xMin = int((roomMin[0] * 100) + (radius * 100))
-        xMax = int((roomMax[0] * 100) - (radius * 100))
-        zMin = int((roomMin[1] * 100) + (radius * 100))
-        zMax = int((roomMax[1] * 100) - (radius * 100))
-
-        #If the object is too big for the room
-        if xMin >= xMax or zMin >= zMax:
-            #Cannot be placed here
-            done = False
-        else:
-            #Get a random x and z position between min and max (with offset for radius)
-            randomX = random.randrange(xMin, xMax) / 100.0
-            randomZ = random.randrange(zMin, zMax) / 100.0
-        
-        #Iterate through the placed items
-        for item in usedSpaces:
-            #Get the distance to the item
-            distance = (((randomX - item[0][0]) ** 2) + ((randomZ - item[0][1]) ** 2)) ** 0.5
-            #If the distance is less than the two radii added together
-            if distance <= radius + item[1]:
-                #It intersects a placed object and cannot be placed here
-                done = False
+    while attempts > 0 or forced:
+        selectedRoomId = validRoomIds[_rng.randrange(0, len(validRoomIds))]
+
+        #If this room has not been selected before
+        if selectedRoomId not in roomBounds:
+            selectedRoom = rooms[selectedRoomId]
+            #Calculate size boundaries (with offset for radius)
+            roomBounds[selectedRoomId] = (selectedRoom[0][0] + radius,
+                                          selectedRoom[1][0] - radius,
+                                          selectedRoom[0][1] + radius,
+                                          selectedRoom[1][1] - radius)
+
+        #Attempt to find a position in the room
+        position = _trySample(roomBounds[selectedRoomId], spaces, spaceGrid, cellSize)
+
+        #If a position was selected
+        if position is not None:
+            #Returns the correct coordinates
+            return position[0], position[1], selectedRoomId
 
         #One more attempt has been used
         attempts = attempts - 1
 
-    #If a position was selected
-    if done:
-        #Returns the correct coordinates
-        return randomX, randomZ, selectedRoomId
-    else:
-        #If no valid place was found after all attempts
-        return None, None, -1
+    #If no valid place was found after all attempts
+    return None, None, -1
     
 
 def setObstaclePositions(obstaclesList: list, obstacleNodes: list, rooms: list, blockedRooms: list, unusablePlaces: list) -> list:
@@ -268,7 +314,7 @@ def setObstaclePositions(obstaclesList: list, obstacleNodes: list, rooms: list,
         #Get obstacle translation
         obstaclePos = obstacle.getField("translation")
         #Calculate the radius
-        radius = (((obstaclesList[i][0] * 0.50) ** 2) + ((obstaclesList[i][2] * 0.50) ** 2)) ** 0.50
+        radius = getRadius(obstaclesList[i])
         #Get random valid position
         x, z, roomNum = generatePosition(radius, rooms, blockedRooms, obstacles + unusablePlaces)
         #If a place was found for the obstacle
@@ -296,17 +342,14 @@ def setActivityPositions(activityItemList: list, activitySizeList: list, activit
         itemPosition = item.getField("translation")
         itemScale = activitySizeList[itemId]
         #Determine the radius of the object
-        radius = (((itemScale[0] * 0.50) ** 2) + ((itemScale[2] * 0.50) ** 2)) ** 0.50
-        #List to contain rooms that cannot be used
-        disallowedRooms = []
-        #Copy all default data
-        for room in unusableRooms:
-            disallowedRooms.append(room)
+        radius = getRadius(itemScale)
+        #Set to contain rooms that cannot be used (copy of all default data)
+        disallowedRooms = set(unusableRooms)
         #Add a room to not allowed if used by another part of the activity
         if len(roomsUsed) > activityAssoc[itemId]:
-            disallowedRooms.append(roomsUsed[activityAssoc[itemId]])
+            disallowedRooms.add(roomsUsed[activityAssoc[itemId]])
         #Get random valid position
-        x, z, roomNum = generatePosition(radius, rooms, unusableRooms + disallowedRooms, unusablePlaces + activityItems, True)
+        x, z, roomNum = generatePosition(radius, rooms, disallowedRooms, unusablePlaces + activityItems, True)
         y = (itemScale[1] / 2.0) + 0.05
         #Add the room number to the list of used rooms
         roomsUsed.append(roomNum)
@@ -328,8 +371,9 @@ def setHumanPositions(numberHumans: int, humanNodes: list, rooms: list, unusable
         human = humanNodes.getMFNode(i)
         #Get human translation and radius
         humanPos = human.getField("translation")
-        humanRad = human.getField("boundingObject").getSFNode().getField("radius").getSFFloat() + 0.5
-        humanY = human.getField("boundingObject").getSFNode().getField("height").getSFFloat()
+        humanBounds = human.getField("boundingObject").getSFNode()
+        humanRad = humanBounds.getField("radius").getSFFloat() + 0.5
+        humanY = humanBounds.getField("height").getSFFloat()
         #Get random valid position
         x, z, roomNum = generatePosition(humanRad, rooms, unusableRooms, unusableSpaces + humans)
         #Only if a valid position was found
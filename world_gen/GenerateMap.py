@@ -1,4 +1,4 @@
-"""Map Generation Main Script Type 2 v2
+"""Map Generation Main Script Type 2 v3
    Written by Robbie Goldman and Alfred Roberts
 
 Changelog:
@@ -20,6 +20,31 @@ Changelog:
  - Based on type 1 but modified to perform maze generation not BSP
  V2:
  - Changed so that the start is the exit too
+ V3:
+ - Empty world rows are built with list comprehensions
+ - Map image is drawn with filled rectangles instead of individual pixels
+ - Visited tiles and disallowed checkpoint spaces are stored in sets
+ - Connection checks store visited tiles in a set
+ - Removed unused Tile.generatePixels (the map image is drawn directly)
+ - Maze and connection searches use the top of the stack instead of a separate pointer
+ - Surrounding tile directions are module level constants
+ - World dimensions are calculated once and passed to getAllAround
+ - Checkpoints are picked from the allowed positions in a quadrant instead of retrying random ones
+ - World file tile data is built in a single pass
+ - Swamps are picked from a list of the free tiles instead of retrying random ones
+ - Tile walls are stored in a single list indexed by direction
+ - Start bay is connected to the maze with openSurround
+ - Obstacle size constraints are looked up from a table instead of branching per obstacle
+ - Trap placement searches the maze once per position instead of once per surrounding tile
+ - End tile is found by clamping the end point inside the border
+ - Tile type is stored as a single code (also its background pixel value) instead of four flags
+ - Tile attributes are read directly inside the generation and output loops instead of through getters
+ - Tile uses __slots__
+ - Random values come from a module level generator instance
+ - Map image is built by pasting a cached image for each kind of tile
+ - Removed unused Tile.getBackgroundPixel
+ - Generator interface only runs when the file is run directly
+ - Generated information text is built with f-strings
 """
 
 import random
@@ -30,231 +55,165 @@ import os
 import GUI
 dirname = os.path.dirname(__file__)
 
+#Random number generator used for generation
+_rng = random.Random()
+
+#Offsets (in order: up, right, down, left) of the surrounding tiles
+aroundDirections = ((0, -1), (1, 0), (0, 1), (-1, 0))
+#For each direction this is the alternative in the opposite direction
+alternateDirections = (2, 3, 0, 1)
+
+#Height, minimum size and maximum size of an obstacle (indexed by whether it is debris)
+obstacleSizes = {False: (0.15, 5, 20), True: (0.01, 2, 5)}
+
+#Code for each kind of tile (also used as the pixel value of its background)
+emptyTile = 0
+checkpointTile = 2
+trapTile = 3
+goalTile = 4
+swampTile = 5
+
+#Colour for each pixel value (background, wall, checkpoint, trap, goal, swamp)
+pixelColours = [(255, 255, 255), (0, 0, 255), (175, 175, 175), (0, 0, 0), (0, 255, 0), (222, 184, 135)]
+
+#Images of each tile appearance that has been drawn (keyed by type code and walls)
+tileImages = {}
+
 #Object to contain information for a map tile
 class Tile ():
+    #Fixed attributes (no per tile dictionary - the world holds one of these for every tile)
+    __slots__ = ("walls", "tileType")
+
     def __init__ (self) -> None:
         '''Initialize the tile with all four walls and no special parts'''
-        #All walls
-        self.upperWall = True
-        self.lowerWall = True
-        self.leftWall = True
-        self.rightWall = True
-        #No special parts
-        self.checkpoint = False
-        self.trap = False
-        self.goal = False
-        self.swamp = False
+        #All walls (upper, right, lower, left - indexed by direction)
+        self.walls = [True, True, True, True]
+        #No special parts (a tile can only have one of checkpoint, trap, goal or swamp)
+        self.tileType = emptyTile
 
     def addWalls (self, wallList: list) -> None:
         '''Add a list of walls'''
-        if 0 in wallList:
-            self.upperWall = True
-        if 1 in wallList:
-            self.rightWall = True
-        if 2 in wallList:
-            self.lowerWall = True
-        if 3 in wallList:
-            self.leftWall = True
+        for direction in wallList:
+            self.walls[direction] = True
 
     def removeWalls (self, wallList: list) -> None:
         '''Remove a list of walls'''
-        if 0 in wallList:
-            self.upperWall = False
-        if 1 in wallList:
-            self.rightWall = False
-        if 2 in wallList:
-            self.lowerWall = False
-        if 3 in wallList:
-            self.leftWall = False
+        for direction in wallList:
+            self.walls[direction] = False
 
     def addCheckpoint (self) -> None:
         '''Add a checkpoint - removes traps, goals and swamps'''
-        self.checkpoint = True
-        self.trap = False
-        self.goal = False
-        self.swamp = False
+        self.tileType = checkpointTile
 
     def removeCheckpoint (self) -> None:
         '''Remove a checkpoint'''
-        self.checkpoint = False
+        if self.tileType == checkpointTile:
+            self.tileType = emptyTile
 
     def addTrap (self) -> None:
         '''Add a trap - removes checkpoints, goals and swamps'''
-        self.trap = True
-        self.checkpoint = False
-        self.goal = False
-        self.swamp = False
+        self.tileType = trapTile
 
     def removeTrap (self) -> None:
         '''Remove a trap'''
-        self.trap = False
+        if self.tileType == trapTile:
+            self.tileType = emptyTile
 
     def addGoal (self) -> None:
         '''Add a goal - removes checkpoints, traps and swamps'''
-        self.goal = True
-        self.checkpoint = False
-        self.trap = False
-        self.swamp = False
+        self.tileType = goalTile
 
     def removeGoal (self) -> None:
         '''Remove a goal'''
-        self.goal = False
+        if self.tileType == goalTile:
+            self.tileType = emptyTile
     
     def addSwamp (self) -> None:
         '''Add a swamp - removes checkpoints, traps and goals'''
-        self.swamp = True
-        self.checkpoint = False
-        self.trap = False
-        self.goal = False
+        self.tileType = swampTile
 
     def removeSwamp (self) -> None:
         '''Remove a swamp'''
-        self.swamp = False
+        if self.tileType == swampTile:
+            self.tileType = emptyTile
     
     def getWalls (self) -> list:
         '''Returns a list of bools which represents if each of the four walls is present'''
-        return [self.upperWall, self.rightWall, self.lowerWall, self.leftWall]
+        return list(self.walls)
 
     def getCheckpoint (self) -> bool:
         '''Return if this tile has a checkpoint'''
-        return self.checkpoint
+        return self.tileType == checkpointTile
 
     def getTrap (self) -> bool:
         '''Return if this tile has a trap'''
-        return self.trap
+        return self.tileType == trapTile
 
     def getGoal (self) -> bool:
         '''Return if this tile has a goal'''
-        return self.goal
+        return self.tileType == goalTile
     
     def getSwamp (self) -> bool:
         '''Return if this tile has a swamp'''
-        return self.swamp
-    
-    def generatePixels (self) -> list:
-        '''Generate a grid of pixels for this tile'''
-        #Array to hold pixel information
-        pixels = []
-
-        #The background pixel colour
-        basicPixel = 0
-
-        #Change background colour if this is a checkpoint / trap / goal / swamp
-        if self.checkpoint:
-            basicPixel = 2
-        if self.trap:
-            basicPixel = 3
-        if self.goal:
-            basicPixel = 4
-        if self.swamp:
-            basicPixel = 5
-
-        #Fill array with background pixels
-        for y in range(0, 20):
-            row = []
-            for x in range(0, 20):
-                row.append(basicPixel)
-            pixels.append(row)
-
-        #Add upper wall
-        if self.upperWall:
-            for x in range(0, 20):
-                pixels[0][x] = 1
-                pixels[1][x] = 1
-        #Add left wall
-        if self.leftWall:
-            for y in range(0, 20):
-                pixels[y][0] = 1
-                pixels[y][1] = 1
-        #Add lower wall
-        if self.lowerWall:
-            for x in range(0, 20):
-                pixels[len(pixels) - 1][x] = 1
-                pixels[len(pixels) - 2][x] = 1
-        #Add right wall
-        if self.rightWall:
-            for y in range(0, 20):
-                pixels[y][len(pixels[0]) - 1] = 1
-                pixels[y][len(pixels[0]) - 2] = 1
-
-        #Return array of pixels
-        return pixels
+        return self.tileType == swampTile
 
 
 def createEmptyWorld(x, y):
     '''Create a new array of x by y containing all walls on all tiles'''
-    array = []
+    #Top row (no tiles here)
+    array = [[None] * (x + 2)]
 
-    #Iterate y axis
-    for i in range(0, y + 2):
+    #Centre rows - a new section of the maze for each tile with no tile on either end
+    array.extend([None] + [Tile() for j in range(0, x)] + [None] for i in range(0, y))
 
-        #Create this row
-        row = []
-
-        #Iterate x axis
-        for j in range(0, x + 2):
-            #For the centre of the map
-            if i != 0 and i != y + 1 and j != 0 and j != x + 1:
-                #Add a new section of the maze
-                row.append(Tile())
-            else:
-                #No tile here
-                row.append(None)
-        #Add the row to the array
-        array.append(row)
+    #Bottom row (no tiles here)
+    array.append([None] * (x + 2))
     
     #Return the generated array
     return array
 
 
+def getTileImage (tile):
+    '''Get the 20 by 20 image of a tile (only drawn the first time each combination of type and walls is seen)'''
+    #Tiles that look the same share an image
+    key = (tile.tileType, tuple(tile.walls))
+    image = tileImages.get(key)
+
+    #If this combination hasn't been drawn yet
+    if image == None:
+        #Create the image filled with the background colour
+        image = Image.new("RGB", (20, 20), pixelColours[tile.tileType])
+        #Add each wall as a 2 pixel wide blue strip
+        upperWall, rightWall, lowerWall, leftWall = tile.walls
+        if upperWall:
+            image.paste(pixelColours[1], (0, 0, 20, 2))
+        if leftWall:
+            image.paste(pixelColours[1], (0, 0, 2, 20))
+        if lowerWall:
+            image.paste(pixelColours[1], (0, 18, 20, 20))
+        if rightWall:
+            image.paste(pixelColours[1], (18, 0, 20, 20))
+        #Store it for the next tile like this
+        tileImages[key] = image
+
+    return image
+
+
 def printWorld(array):
     '''Output the array as a map image file'''
     #Create a new image with the same dimensions as the array (in rgb mode with white background)
     img = Image.new("RGB", (len(array[0]) * 20, len(array) * 20), "#FFFFFF")
-
-    xStart = 0
-    yStart = 0
     
     #Iterate across x axis
     for i in range(len(array[0])):
-        #Reset y start position each loop
-        yStart = 0
         #Iterate across y axis
         for j in range(len(array)):
             #Get that tile
             tile = array[j][i]
             #If there is a tile there
             if tile != None:
-                #Get the pixels for the tile
-                pixels = tile.generatePixels()
-                #Iterate across x of pixels
-                for x in range(0, 20):
-                    #Iterate across y of pixels
-                    for y in range(0, 20):
-                        #If there is a wall
-                        if pixels[y][x] == 1:
-                            #Add blue pixel
-                            img.putpixel((xStart + x, yStart + y), (0, 0, 255))
-                        #If there is a checkpoint
-                        if pixels[y][x] == 2:
-                            #Add grey pixel
-                            img.putpixel((xStart + x, yStart + y), (175, 175, 175))
-                        #If there is a trap
-                        if pixels[y][x] == 3:
-                            #Add black pixel
-                            img.putpixel((xStart + x, yStart + y), (0, 0, 0))
-                        #If there is a goal
-                        if pixels[y][x] == 4:
-                            #Add green pixel
-                            img.putpixel((xStart + x, yStart + y), (0, 255, 0))
-                        #If there is a swamp
-                        if pixels[y][x] == 5:
-                            #Add tan pixel
-                            img.putpixel((xStart + x, yStart + y), (222, 184, 135))
-            #Increase y start each pass
-            yStart = yStart + 20
-        #Increase x start position each time
-        xStart = xStart + 20
+                #Copy the image of the tile to its top left corner
+                img.paste(getTileImage(tile), (i * 20, j * 20))
     
     #Save the completed image to file
     img.save(os.path.join(dirname, "map.png"), "PNG")
@@ -262,16 +221,12 @@ def printWorld(array):
 
 def openSurround(world, target, direction):
     '''Opens a the wall in the given direction. Both the target tile and the one adjacent to it.'''
-    #Directions (in order) of the surrounding tiles
-    around = [[0, -1], [1, 0], [0, 1], [-1, 0]]
-    #For each direction this is the alternative in the opposite direction
-    alternateDirections = [2, 3, 0, 1]
-
     #Get the target tile
     thisTile = world[target[1]][target[0]]
 
     #Get the position of the tile being opened to
-    opened = [target[0] + around[direction][0], target[1] + around[direction][1]]
+    offset = aroundDirections[direction]
+    opened = [target[0] + offset[0], target[1] + offset[1]]
 
     #Get the other tile
     thatTile = world[opened[1]][opened[0]]
@@ -284,142 +239,105 @@ def openSurround(world, target, direction):
     return opened
 
 
-def getAllAround (world, pos):
-    '''Return a list of the 4 surrounding tiles'''
+def getAllAround (pos, width, height):
+    '''Return a list of the 4 surrounding tiles (within a world of width by height including the border)'''
     aroundPositions = []
     aroundDirs = []
-    #Surrounding directions
-    around = [[0, -1], [1, 0], [0, 1], [-1, 0]]
 
-    #Initialize direction
-    d = 0
-    #Iterate for each surrounding tile
-    for a in around:
+    #Iterate for each surrounding tile and its direction
+    for d, a in enumerate(aroundDirections):
         #Get the position
         otherPos = [pos[0] + a[0], pos[1] + a[1]]
         #If the position is in the grid
-        if otherPos[0] > 0 and otherPos[0] < len(world[0]) - 1 and otherPos[1] > 0 and otherPos[1] < len(world) - 1:
+        if otherPos[0] > 0 and otherPos[0] < width - 1 and otherPos[1] > 0 and otherPos[1] < height - 1:
             #Add position and direction to list
             aroundPositions.append(otherPos)
             aroundDirs.append(d)
-        #Increment the direction
-        d = d + 1
 
     #Return the tiles and directions
     return aroundPositions, aroundDirs
 
 def depthFirstMaze (world, start):
     '''Generate a maze using depth first search'''
-    #List of tiles that have been visited
-    visited = [start]
-    #The current stack - allowing for backtracking
+    #Set of tiles that have been visited (as tuples for constant time lookup)
+    visited = {tuple(start)}
+    #The current stack - allowing for backtracking (the top is the current tile)
     stack = [start]
 
-    #Currently selected point on the stack
-    pointer = 0
+    #Dimensions of the world (including the border)
+    width = len(world[0])
+    height = len(world)
 
-    #If the algorithm has finished
-    done = False
-
-    #While it is still generating
-    while not done:
+    #While it is still generating (until it has retreated past the start)
+    while len(stack) > 0:
         usable = []
         #Get all the tiles around the current one
-        posList, directions = getAllAround(world, stack[pointer])
+        posList, directions = getAllAround(stack[-1], width, height)
         #Iterate through found tiles
         for i in range(len(posList)):
             #If it hasn't been visited yet
-            if posList[i] not in visited:
+            if tuple(posList[i]) not in visited:
                 #Add to the list of usable tiles with it's direction
                 usable.append([posList[i], directions[i]])
 
         #If there are tiles that can be reached
         if len(usable) > 0:
             #Pick a random tile
-            r = random.randrange(0, len(usable))
+            r = _rng.randrange(0, len(usable))
             #Open the wall to that tile
-            openSurround(world, stack[pointer], usable[r][1])
+            openSurround(world, stack[-1], usable[r][1])
             #Add tile to visited
-            visited.append(usable[r][0])
-            #Add tile to stack
+            visited.add(tuple(usable[r][0]))
+            #Add tile to stack (it is now the current tile)
             stack.append(usable[r][0])
-            #Increment pointer to point at new tile
-            pointer = pointer + 1
         else:
             #If there are no unvisited tiles to go to
-            #Decrement pointer (go back a tile)
-            pointer = pointer - 1
-            #Remove last item from stack
-            del stack[len(stack) - 1]
-            #If the pointer has retreated past the start
-            if pointer < 0:
-                #The algorithm is finished
-                done = True
-
-
-def checkConnect (world, start, check, avoid):
-    '''Check if the start and check points can be connected without avoid'''
-    #List of used tiles
-    visited = [start, avoid]
-    #Stack to hold the tile path
-    stack = [start]
+            #Remove last item from stack (go back a tile)
+            stack.pop()
 
-    #Pointer - current tile
-    pointer = 0
 
-    #Finished
-    done = False
+def getConnected (world, start, avoid):
+    '''Get the set of tiles that can be reached from start without passing through avoid or a trap (not including start)'''
+    #Set of used tiles (as tuples for constant time lookup)
+    visited = {tuple(start), tuple(avoid)}
+    #Stack of tiles that have been reached but not yet searched from
+    stack = [start]
 
-    #Until it has finished
-    while not done:
-        usable = []
+    #Dimensions of the world (including the border)
+    width = len(world[0])
+    height = len(world)
+
+    #Until every reachable tile has been searched from
+    while len(stack) > 0:
+        current = stack.pop()
         #Get surrounding tiles
-        posList, directions = getAllAround(world, stack[pointer])
+        posList, directions = getAllAround(current, width, height)
         #Get the walls of the current tile
-        tileWalls = world[stack[pointer][1]][stack[pointer][0]].getWalls()
+        tileWalls = world[current[1]][current[0]].walls
         #Iterate surrounding tiles
         for i in range(len(posList)):
+            pos = tuple(posList[i])
             #If the tile hasn't already been visited and the wall is open to get to it
-            if posList[i] not in visited and not tileWalls[directions[i]]:
+            if pos not in visited and not tileWalls[directions[i]]:
                 #Get the tile that corresponds to that movement
-                otherTile = world[posList[i][1]][posList[i][0]]
-                #If there is a tile there
-                if otherTile != None:
-                    #If that tile isn't a trap
-                    if not otherTile.getTrap():
-                        #Add the tile to usable tiles
-                        usable.append([posList[i], directions[i]])
-
-        #Iterate through usable tiles
-        for u in usable:
-            #If it is the tile being searched for
-            if u[0] == check:
-                #The connection can be made
-                return True
-
-        #If there are tiles to go to
-        if len(usable) > 0:
-            #Move to the next one
-            visited.append(usable[0][0])
-            stack.append(usable[0][0])
-            pointer = pointer + 1
-        else:
-            #Move back a tile
-            pointer = pointer - 1
-            del stack[len(stack) - 1]
-            #If it has moved back past the start
-            if pointer < 0:
-                #It has finished
-                done = True
+                otherTile = world[pos[1]][pos[0]]
+                #If there is a tile there and it isn't a trap
+                if otherTile != None and otherTile.tileType != trapTile:
+                    #The tile can be reached, search from it later
+                    visited.add(pos)
+                    stack.append(posList[i])
 
-    #Connection could not be made
-    return False
+    #The start and avoided tiles were only marked to stop them being entered
+    visited.discard(tuple(start))
+    visited.discard(tuple(avoid))
+
+    return visited
 
 
 def addCheckPoints(array, checkpoints, startTile, endTile, x, y):
     '''Add a number of checkpoints to the map'''
-    #Cannot put a checkpoint at the start or end
-    disallowedSpaces = [startTile, endTile]
+    #Cannot put a checkpoint at the start or end (stored as tuples for constant time lookup)
+    disallowedSpaces = {tuple(startTile), tuple(endTile)}
     #Split the grid into quadrants
     quads = [[[1, 1], [int(x / 2), int(y / 2)]],
              [[x + 1 - int(x / 2), 1], [x, y - int(y / 2)]],
@@ -428,33 +346,32 @@ def addCheckPoints(array, checkpoints, startTile, endTile, x, y):
 
     #For each of the checkpoints
     for i in range(0, checkpoints):
-        #Not added yet
-        added = False
         #Get a random quadrant
-        rQ = random.randrange(0, len(quads))
+        rQ = _rng.randrange(0, len(quads))
         q = quads[rQ]
         #Remove the quadrant
         del quads[rQ]
-        #Until it has added the checkpoint
-        while not added:
-            #Get a random position
-            xPos = random.randint(q[0][0], q[1][0])
-            yPos = random.randint(q[0][1], q[1][1])
-            #If it is allowed to put the checkpoint there
-            if [xPos, yPos] not in disallowedSpaces:
-                #Get the tile
-                tile = array[yPos][xPos]
-                #If there isn't already a checkpoint or trap there
-                if not tile.getCheckpoint() and not tile.getTrap():
-                    #Add a checkpoint
-                    tile.addCheckpoint()
-                    #Add this tile and four surrounding to not allowed spaces
-                    disallowedSpaces.append([xPos, yPos])
-                    around = [[0, -1], [1, 0], [0, 1], [-1, 0]]
-                    for a in around:
-                        disallowedSpaces.append([xPos + a[0], yPos + a[1]])
-                    #The checkpoint has been added
-                    added = True
+        #All the positions in the quadrant that the checkpoint is allowed to be put in
+        eligible = []
+        for xPos in range(q[0][0], q[1][0] + 1):
+            for yPos in range(q[0][1], q[1][1] + 1):
+                #If it is allowed to put the checkpoint there
+                if (xPos, yPos) not in disallowedSpaces:
+                    #Get the tile
+                    tile = array[yPos][xPos]
+                    #If there isn't already a checkpoint or trap there
+                    if tile != None and tile.tileType != checkpointTile and tile.tileType != trapTile:
+                        eligible.append((xPos, yPos))
+        #If there is somewhere to put the checkpoint
+        if len(eligible) > 0:
+            #Pick a random position
+            xPos, yPos = _rng.choice(eligible)
+            #Add a checkpoint
+            array[yPos][xPos].addCheckpoint()
+            #Add this tile and four surrounding to not allowed spaces
+            disallowedSpaces.add((xPos, yPos))
+            for a in aroundDirections:
+                disallowedSpaces.add((xPos + a[0], yPos + a[1]))
 
 
 def addTraps(array, traps, startTile, endTile, x, y):
@@ -472,30 +389,33 @@ def addTraps(array, traps, startTile, endTile, x, y):
         #Until the trap has been added
         while not added:
             #Pick a random quadrant
-            rQ = random.randrange(0, len(quads))
+            rQ = _rng.randrange(0, len(quads))
             q = quads[rQ]
             #Generate a random position
-            xPos = random.randint(q[0][0], q[1][0])
-            yPos = random.randint(q[0][1], q[1][1])
+            xPos = _rng.randint(q[0][0], q[1][0])
+            yPos = _rng.randint(q[0][1], q[1][1])
             #Get the tile
             tile = array[yPos][xPos]
             #If it isn't the start or end and there is a tile there
             if [xPos, yPos] != startTile and [xPos, yPos] != endTile and tile != None:
                 #If there isn't a checkpoint
-                if not tile.getCheckpoint():
+                if tile.tileType != checkpointTile:
                     allowed = True
-                    #Surrounding tile positions
-                    around = [[0, -1], [1, 0], [0, 1], [-1, 0]]
+                    #Tiles that can still be reached from the start with a trap here (only searched for when needed)
+                    connected = None
                     #Iterate for surrounding
-                    for a in around:
+                    for a in aroundDirections:
                         #Get the tile
                         checkTile = array[yPos + a[1]][xPos + a[0]]
                         #If there is a tile there
                         if checkTile != None:
                             #If there isn't a trap there
-                            if not checkTile.getTrap():
+                            if checkTile.tileType != trapTile:
+                                #Search once for every tile connected to the start
+                                if connected == None:
+                                    connected = getConnected(array, startTile, [xPos, yPos])
                                 #If a connection cannot be made to the start
-                                if not checkConnect(array, startTile ,[xPos + a[0], yPos + a[1]], [xPos, yPos]):
+                                if (xPos + a[0], yPos + a[1]) not in connected:
                                     #The trap cannot be placed here
                                     allowed = False
 
@@ -509,27 +429,21 @@ def addTraps(array, traps, startTile, endTile, x, y):
 
 def addSwamps(array, swamps, startTile, endTile, x, y):
     '''Adds a number of swamps to the map'''
-    #Iterate for each swamp
-    print(swamps)
-    for i in range(0, swamps):
-        #Not added yet
-        added = False
-        attempt = 0
-        #Repeat until added or 100 tries reached
-        while not added and attempt < 100:
-            #Get a random tile
-            xPos = random.randrange(1, x)
-            yPos = random.randrange(1, y)
+    #All the positions a swamp can be put in
+    eligible = []
+    #Iterate all the tiles
+    for xPos in range(1, x):
+        for yPos in range(1, y):
             tile = array[yPos][xPos]
             #If this isn't the start, end or not a tile
             if [xPos, yPos] != startTile and [xPos, yPos] != endTile and tile != None:
                 #If there is nothing there already
-                if not tile.getGoal() and not tile.getCheckpoint() and not tile.getSwamp() and not tile.getTrap():
-                    #Add the swamp
-                    tile.addSwamp()
-                    added = True
-            #Increment counter
-            attempt = attempt + 1
+                if tile.tileType == emptyTile:
+                    eligible.append(tile)
+
+    #Add the swamps to randomly selected tiles (as many as there is room for)
+    for tile in _rng.sample(eligible, min(swamps, len(eligible))):
+        tile.addSwamp()
             
 
 def generateWorld(x, y, checkpoints, traps, swamps):
@@ -537,91 +451,67 @@ def generateWorld(x, y, checkpoints, traps, swamps):
     #Create the empty array
     array = createEmptyWorld(x, y)
 
+    #Dimensions of the array (including the border)
+    width = len(array[0])
+    height = len(array)
+
     #Pick a starting edge
-    startEdge = random.randrange(0, 4)
+    startEdge = _rng.randrange(0, 4)
     xStart = 0
     yStart = 0
 
-    startTile = [0, 0]
-    startBay  = [0, 0]
     startDir = 0
 
     #Top edge
     if startEdge == 0:
         #Pick start position
         yStart = 0
-        xStart = random.randrange(1, len(array[0]) - 1)
-        #Add a tile for the start
-        array[yStart][xStart] = Tile()
-        startBay = [xStart, yStart]
-        #Remove the walls to connect it to the maze
-        array[yStart][xStart].removeWalls([2])
-        array[yStart + 1][xStart].removeWalls([0])
-        #Take a record of the position of the start tile in the maze
-        startTile = [xStart, yStart + 1]
+        xStart = _rng.randrange(1, width - 1)
         #Set start direction
         startDir = 2
     #Right edge
     if startEdge == 1:
         #Pick start position
-        xStart = len(array[0]) - 1
-        yStart = random.randrange(1, len(array) - 1)
-        #Add a tile for the start
-        array[yStart][xStart] = Tile()
-        startBay = [xStart, yStart]
-        #Remove the walls to connect it to the maze
-        array[yStart][xStart].removeWalls([3])
-        array[yStart][xStart - 1].removeWalls([1])
-        #Take a record of the position of the start tile in the maze
-        startTile = [xStart - 1, yStart]
+        xStart = width - 1
+        yStart = _rng.randrange(1, height - 1)
         #Set start direction
         startDir = 3
     #Bottom edge
     if startEdge == 2:
         #Pick start position
-        yStart = len(array) - 1
-        xStart = random.randrange(1, len(array[0]) - 1)
-        #Add a tile for the start
-        array[yStart][xStart] = Tile()
-        startBay = [xStart, yStart]
-        #Remove the walls to connect it to the maze
-        array[yStart][xStart].removeWalls([0])
-        array[yStart - 1][xStart].removeWalls([2])
-        #Take a record of the position of the start tile in the maze
-        startTile = [xStart, yStart - 1]
+        yStart = height - 1
+        xStart = _rng.randrange(1, width - 1)
         #Set start direction
         startDir = 0
     #Left edge
     if startEdge == 3:
         #Pick start position
         xStart = 0
-        yStart = random.randrange(1, len(array) - 1)
-        #Add a tile for the start
-        array[yStart][xStart] = Tile()
-        startBay = [xStart, yStart]
-        #Remove the walls to connect it to the maze
-        array[yStart][xStart].removeWalls([1])
-        array[yStart][xStart + 1].removeWalls([3])
-        #Take a record of the position of the start tile in the maze
-        startTile = [xStart + 1, yStart]
+        yStart = _rng.randrange(1, height - 1)
         #Set start direction
         startDir = 1
 
+    #Add a tile for the start
+    array[yStart][xStart] = Tile()
+    startBay = [xStart, yStart]
+    #Remove the walls to connect it to the maze (in the start direction) and take a record of the position of the start tile in the maze
+    startTile = openSurround(array, startBay, startDir)
+
     #Calculate minimum orthogonal distance between start and end
     minDistance = min(10, int((x + y) / 2) + 1)
     possibleEnd = []
 
     #Iterate horizontal edges
-    for xEnd in range(1, len(array[0]) - 1):
-        for yEnd in [0, len(array) - 1]:
+    for xEnd in range(1, width - 1):
+        for yEnd in [0, height - 1]:
             #Test if distance is enough
             if abs(xStart - xEnd) + abs(yStart - yEnd) - 1 >= minDistance:
                 #Add to possible end points
                 possibleEnd.append([xEnd, yEnd])
 
     #Iterate vertical edges
-    for yEnd in range(1, len(array) - 1):
-        for xEnd in [0, len(array[0]) - 1]:
+    for yEnd in range(1, height - 1):
+        for xEnd in [0, width - 1]:
             #Test if distance is enough
             if abs(xStart - xEnd) + abs(yStart - yEnd) - 1 >= minDistance:
                 #Add to possible end points
@@ -632,37 +522,9 @@ def generateWorld(x, y, checkpoints, traps, swamps):
     #If there are some possible end points
     if len(possibleEnd) > 0:
         #Get an end position (chosen randomly)
-        xEnd, yEnd = possibleEnd[random.randrange(0, len(possibleEnd))]
-        #Add a tile where the goal is
-        #array[yEnd][xEnd] = Tile()
-        #Top edge
-        if xEnd == 0:
-            #Remove the walls to connect goal to maze
-            #array[yEnd][xEnd].removeWalls([1])
-            #array[yEnd][xEnd + 1].removeWalls([3])
-            #Store the position of the end of the maze
-            endTile = [xEnd + 1, yEnd]
-        #Right edge
-        if xEnd == len(array[0]) - 1:
-            #Remove the walls to connect goal to maze
-            #array[yEnd][xEnd].removeWalls([3])
-            #array[yEnd][xEnd - 1].removeWalls([1])
-            #Store the position of the end of the maze
-            endTile = [xEnd - 1, yEnd]
-        #Bottom edge
-        if yEnd == 0:
-            #Remove the walls to connect goal to maze
-            #array[yEnd][xEnd].removeWalls([2])
-            #array[yEnd + 1][xEnd].removeWalls([0])
-            #Store the position of the end of the maze
-            endTile = [xEnd, yEnd + 1]
-        #Left edge
-        if yEnd == len(array) - 1:
-            #Remove the walls to connect goal to maze
-            #array[yEnd][xEnd].removeWalls([0])
-            #array[yEnd - 1][xEnd].removeWalls([2])
-            #Store the position of the end of the maze
-            endTile = [xEnd, yEnd - 1]
+        xEnd, yEnd = possibleEnd[_rng.randrange(0, len(possibleEnd))]
+        #Store the position of the end of the maze (the tile inside the border next to the end point)
+        endTile = [min(max(xEnd, 1), width - 2), min(max(yEnd, 1), height - 2)]
 
         #Add a goal to the end point
         array[yStart][xStart].addGoal()
@@ -673,14 +535,14 @@ def generateWorld(x, y, checkpoints, traps, swamps):
     #Open some random spaces
     for i in range(0, int((x + y) / 2) ** 2):
         #Random position
-        randX = random.randrange(1, len(array[0]) - 1)
-        randY = random.randrange(1, len(array) - 1)
+        randX = _rng.randrange(1, width - 1)
+        randY = _rng.randrange(1, height - 1)
         #Get the valid directions
-        allowedDirs = getAllAround(array, [randX, randY])[1]
+        allowedDirs = getAllAround([randX, randY], width, height)[1]
         #If there are some positions that can be opened
         if len(allowedDirs) > 0:
             #Get a direction to open
-            d = allowedDirs[random.randrange(0, len(allowedDirs))]
+            d = allowedDirs[_rng.randrange(0, len(allowedDirs))]
             #Open that direction (if it is already open it will do nothing)
             openSurround(array, [randX, randY], d)
 
@@ -699,41 +561,20 @@ def generateWorld(x, y, checkpoints, traps, swamps):
 
 def addObstacle(debris):
     '''Generate random dimensions for an obstacle'''
-    #Default height for static obstacle
-    height = 0.15
-    #Adjust height for debris
-    if debris:
-        height = 0.01
-    #Default size contstraints for static obstacle
-    minSize = 5
-    maxSize = 20
-    #Adjust size constraints for debris
-    if debris:
-        minSize = 2
-        maxSize = 5
+    #Height and size constraints for static obstacle or debris
+    height, minSize, maxSize = obstacleSizes[debris]
     #Generate random size
-    width = float(random.randrange(minSize, maxSize)) / 100.0
-    depth = float(random.randrange(minSize, maxSize)) / 100.0
+    width = _rng.randrange(minSize, maxSize) / 100.0
+    depth = _rng.randrange(minSize, maxSize) / 100.0
     #Create obstacle
-    obstacle = [width, height, depth, debris]
-    return obstacle
+    return [width, height, depth, debris]
 	
 
 def generateObstacles(bulky, debris):
     '''Generate a list of obstacles of length numObstacles'''
-    #List to hold obstacle dimensions
-    obstacles = []
-    #Iterate for each static obstacle
-    for i in range(0, bulky):
-        #Create an obstacle and add it to the list
-        newObstacle = addObstacle(False)
-        obstacles.append(newObstacle)
-
-    #Iterate for each piece of debris
-    for i in range(0, debris):
-        #Create an obstacle and add it to the list
-        newObstacle = addObstacle(True)
-        obstacles.append(newObstacle)
+    #Create each static obstacle followed by each piece of debris
+    obstacles = [addObstacle(False) for i in range(bulky)]
+    obstacles.extend([addObstacle(True) for i in range(debris)])
 
     #Return the list of dimensions
     return obstacles
@@ -760,25 +601,24 @@ def generateWorldFile (world, obstacles, numThermal, numVisual, startPos, window
     #Array of wall tiles
     walls = []
 
-    #Iterate vertically
-    for y in range(0, len(world) + 1):
-        #Create a row
+    #Dimensions of the world
+    width = len(world[0])
+    height = len(world)
+
+    #Iterate vertically (with one extra row)
+    for y in range(0, height + 1):
+        #Create a row - each tile [present, [uWall,rWall,dWall,lWall], checkpoint, trap, goal, swamp]
         row = []
-        #Iterate horizontally
-        for x in range(0, len(world[0]) + 1):
-            #Add each tile [present, [uWall,rWall,dWall,lWall], checkpoint, trap, goal, swamp]
-            row.append([False, [False, False, False, False], False, False, False, False])
+        #If this row is in the world
+        if y < height:
+            #Add the data for each tile in the row (empty if there is no tile there)
+            row = [[False, [False, False, False, False], False, False, False, False] if tile == None else
+                   [True, list(tile.walls), tile.tileType == checkpointTile, tile.tileType == trapTile, tile.tileType == goalTile, tile.tileType == swampTile] for tile in world[y]]
+        #Fill the rest of the row with empty tiles (one extra column)
+        row.extend([False, [False, False, False, False], False, False, False, False] for x in range(len(row), width + 1))
         #Add row to array
         walls.append(row)
 
-    #Iterate for each of the tiles
-    for y in range(0, len(world)):
-        for x in range(0, len(world[0])):
-            #If there is a tile there
-            if world[y][x] != None:
-                #Add the wall data
-                walls[y][x] = [True, world[y][x].getWalls(), world[y][x].getCheckpoint(), world[y][x].getTrap(), world[y][x].getGoal(), world[y][x].getSwamp()]
-
     #Make a map from the walls and objects
     WorldCreator.makeFile(walls, obstacles, numThermal, numVisual, startPos, window)
 
@@ -793,66 +633,68 @@ def checkNoNones (dataValues):
     #Otherwise
     return True
 
-#Generate an empty map (to be loaded to begin)
-printWorld(createEmptyWorld(1, 1))
-
-
-#Create an instacnce of the user interface
-window = GUI.GenerateWindow()
-
-#The UI is currently in use
-guiActive = True
-
-#Set all generation parameters to Nones
-world = None
-obstacles = None
-thermalHumans = None
-visualHumans = None
-startTilePos = None
-
-#Loop while the UI is active
-while guiActive:
-
-    #If a generation is being called for
-    if window.ready:
-        #Cannot save now
-        window.setSaveButton(False)
-        #Get generation values as follows:
-        #[[xSize ySize], [thermal, visual], [bulky, debris], [checkpoints, traps, swamps]]
-        genValues = window.getValues()
-        #A generation has started (resets flag so generation is not called again)
-        window.generateStarted()
-        #Generate a plan with the values
-        world, obstacles, startTilePos = generatePlan(genValues[0][0], genValues[0][1], genValues[3][0], genValues[3][1], genValues[2][0], genValues[2][1], genValues[3][2])
-        #Unpack the unused human values
-        thermalHumans, visualHumans = genValues[1][0], genValues[1][1]
-        #Unpack the used obstacle counts
-        bulkyObstacles, debris = genValues[2][0], genValues[2][1]
-        #Update the UI image of the map
-        window.updateImage()
-
-        #Update the output fields of the window
-        window.setGeneratedInformation("Thermal: " + str(thermalHumans), "Visual: " + str(visualHumans), "Bulky: " + str(bulkyObstacles), "Debris: " + str(debris))
-
-    #If a save file is being called for
-    if window.saving:
-        #Cannot save now
-        window.setSaveButton(False)
-        #Saving has begin (resets flag so save is not called twice)
-        window.saveStarted()
-        #If all values that are needed are not None
-        if checkNoNones([world, obstacles, thermalHumans, visualHumans, startTilePos]):
-            #Generate and save a world
-            generateWorldFile(world, obstacles, thermalHumans, visualHumans, startTilePos, window)
-
-    #Attempt update loops           
-    try:
-        #Toggle the save button to the correct state
-        window.setSaveButton(checkNoNones([world, obstacles, thermalHumans, visualHumans, startTilePos]))
-        #Update loops for the UI - manually called to prevent blocking of this program
-        window.update_idletasks()
-        window.update()
-    #If an error occurred in the update (window closed)
-    except:
-        #Terminate the UI loop
-        guiActive = False
+#Only run the generator interface when this file is run directly (not when imported)
+if __name__ == "__main__":
+    #Generate an empty map (to be loaded to begin)
+    printWorld(createEmptyWorld(1, 1))
+
+
+    #Create an instacnce of the user interface
+    window = GUI.GenerateWindow()
+
+    #The UI is currently in use
+    guiActive = True
+
+    #Set all generation parameters to Nones
+    world = None
+    obstacles = None
+    thermalHumans = None
+    visualHumans = None
+    startTilePos = None
+
+    #Loop while the UI is active
+    while guiActive:
+
+        #If a generation is being called for
+        if window.ready:
+            #Cannot save now
+            window.setSaveButton(False)
+            #Get generation values as follows:
+            #[[xSize ySize], [thermal, visual], [bulky, debris], [checkpoints, traps, swamps]]
+            genValues = window.getValues()
+            #A generation has started (resets flag so generation is not called again)
+            window.generateStarted()
+            #Generate a plan with the values
+            world, obstacles, startTilePos = generatePlan(genValues[0][0], genValues[0][1], genValues[3][0], genValues[3][1], genValues[2][0], genValues[2][1], genValues[3][2])
+            #Unpack the unused human values
+            thermalHumans, visualHumans = genValues[1][0], genValues[1][1]
+            #Unpack the used obstacle counts
+            bulkyObstacles, debris = genValues[2][0], genValues[2][1]
+            #Update the UI image of the map
+            window.updateImage()
+
+            #Update the output fields of the window
+            window.setGeneratedInformation(f"Thermal: {thermalHumans}", f"Visual: {visualHumans}", f"Bulky: {bulkyObstacles}", f"Debris: {debris}")
+
+        #If a save file is being called for
+        if window.saving:
+            #Cannot save now
+            window.setSaveButton(False)
+            #Saving has begin (resets flag so save is not called twice)
+            window.saveStarted()
+            #If all values that are needed are not None
+            if checkNoNones([world, obstacles, thermalHumans, visualHumans, startTilePos]):
+                #Generate and save a world
+                generateWorldFile(world, obstacles, thermalHumans, visualHumans, startTilePos, window)
+
+        #Attempt update loops           
+        try:
+            #Toggle the save button to the correct state
+            window.setSaveButton(checkNoNones([world, obstacles, thermalHumans, visualHumans, startTilePos]))
+            #Update loops for the UI - manually called to prevent blocking of this program
+            window.update_idletasks()
+            window.update()
+        #If an error occurred in the update (window closed)
+        except:
+            #Terminate the UI loop
+            guiActive = False
@@ -27,10 +27,10 @@ def getAllWalls(numberWalls: int) -> list:
     #Iterate for each of the walls
     for wallNumber in range(0, numberWalls):
         #Get the wall's position from the wall solid object
-        wallObj = supervisor.getFromDef("WALL" + str(wallNumber))
+        wallObj = supervisor.getFromDef(f"WALL{wallNumber}")
         position = wallObj.getField("translation").getSFVec3f()
         #Get the wall's scale from the geometry
-        wallBoxObj = supervisor.getFromDef("WALLBOX" + str(wallNumber))
+        wallBoxObj = supervisor.getFromDef(f"WALLBOX{wallNumber}")
         scale = wallBoxObj.getField("size").getSFVec3f()
         #Create the wall 2D list
         wall = [position, scale]
@@ -48,7 +48,7 @@ def getAllObstacles(numberObstacles: int) -> list:
     #Iterate for obstacles
     for obstacleNumber in range(0, numberObstacles):
         #Obtain the object for the obstacle
-        obstacleBoxObj = supervisor.getFromDef("OBSTACLEBOX" + str(obstacleNumber))
+        obstacleBoxObj = supervisor.getFromDef(f"OBSTACLEBOX{obstacleNumber}")
         #Get the obstacles scale
         scale = obstacleBoxObj.getField("size").getSFVec3f()
         #Add to list of obstacles
@@ -65,8 +65,8 @@ def getAllBases() -> list:
     #Iterate for the bases
     for i in range(0, 3):
         #Get the minimum and maximum position vectors
-        minBase = supervisor.getFromDef("base" + str(i) + "Min").getField("translation").getSFVec3f()
-        maxBase = supervisor.getFromDef("base" + str(i) + "Max").getField("translation").getSFVec3f()
+        minBase = supervisor.getFromDef(f"base{i}Min").getField("translation").getSFVec3f()
+        maxBase = supervisor.getFromDef(f"base{i}Max").getField("translation").getSFVec3f()
         #Create the base (midpoint of the min and max: min + (max-min/2))
         base = [((maxBase[0] - minBase[0]) / 2.0) + minBase[0], ((maxBase[2] - minBase[2]) / 2.0) + minBase[2]]
         #Add to list of bases
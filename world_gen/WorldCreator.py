@@ -1,4 +1,4 @@
-"""Map Generation World File Creator Type 2 v2
+"""Map Generation World File Creator Type 2 v3
    Written by Robbie Goldman and Alfred Roberts
 
 Changelog:
@@ -20,13 +20,54 @@ Changelog:
  - Overhauled to change from a floor and external walls into modular pieces
  V2:
  - Changed to use proto nodes for tiles
+ V3:
+ - File data is collected in lists and joined instead of repeatedly concatenating strings
+ - Template files are only read the first time they are needed
+ - Format functions of the per tile and per obstacle templates are looked up once
+ - Removed unused Decimal import
+ - Tile centre positions are calculated once per row and column
+ - World file is written in binary mode
+ - Loop counters use enumerate
+ - Each tile's data is unpacked once instead of indexed for every value
+ - Robots are added from a table of placements for each start direction
+ - Tile true and false values are formatted as file text directly instead of replaced afterwards
+ - Files are opened in with blocks so they are always closed
+ - Tile boundary edges are calculated once per row and column
+ - Save path is resolved in its own function before the file data is created
+ - File data is written in parts to a temporary file that then replaces the world file
+ - Uses an f-string to add the file extension
 """
 
 
-from decimal import Decimal
 import os
+import io
 dirname = os.path.dirname(__file__)
 
+#Text used for a true or false value in the world file
+boolText = {True: "TRUE", False: "FALSE"}
+
+#Position offset [x, z] of each robot from the centre of the start tile and the rotation of both robots for each start direction
+#(up: spaced -X, +X; right: spaced -Z, +Z; down: spaced +X, -X; left: spaced +Z, -Z)
+robotPlacements = [[[[-0.075, 0], [0.075, 0]], 0],
+                   [[[0, -0.075], [0, 0.075]], -1.5708],
+                   [[[0.075, 0], [-0.075, 0]], 3.14159],
+                   [[[0, 0.075], [0, -0.075]], 1.5708]]
+
+#Contents of each template file that has been read (keyed by file name)
+templateCache = {}
+
+def loadTemplate (fileName):
+    '''Get the contents of a template file (only read from disk the first time it is needed)'''
+    #If the template hasn't been read yet
+    if fileName not in templateCache:
+        #Open the template file (closed when done, even if reading fails)
+        with open(os.path.join(dirname, fileName), "r") as templateFile:
+            #Read and store the template
+            templateCache[fileName] = templateFile.read()
+
+    return templateCache[fileName]
+
+
 def checkForCorners(pos, walls):
     '''Check if each of the corners is needed'''
     #Surrounding tile directions
@@ -79,9 +120,8 @@ def checkForExternalWalls (pos, walls):
     around = [[0, -1], [1, 0], [0, 1], [-1, 0]]
     otherTiles = [False, False, False, False]
 
-    d = 0
-    
-    for a in around:
+    #Iterate surrounding tiles with their direction
+    for d, a in enumerate(around):
         #Get the tiles position
         xPos = pos[0] + a[0]
         yPos = pos[1] + a[1]
@@ -92,8 +132,6 @@ def checkForExternalWalls (pos, walls):
         else:
             #No tile present
             otherTiles[d] = False
-        #Add one to direction counter
-        d = d + 1
 
     #Convert to needed walls
     externalsNeeded = [not otherTiles[0], not otherTiles[1], not otherTiles[2], not otherTiles[3]]
@@ -120,16 +158,14 @@ def checkForNotch (pos, walls):
                    [ [-1, 1], [1, 1] ],
                    [ [-1, -1], [-1, 1] ]]
 
-    #Current direction
-    d = 0
     #Number of surrounding tiles
     surround = 0
 
     #Direction of present tile
     dire = -1
 
-    #Iterate for surrounding tiles
-    for a in around:
+    #Iterate for surrounding tiles (with the current direction)
+    for d, a in enumerate(around):
         #If x axis is within array
         if pos[0] + a[0] < len(walls[0]) and pos[0] + a[0] > -1:
             #If y axis is within array
@@ -140,8 +176,6 @@ def checkForNotch (pos, walls):
                     surround = surround + 1
                     #Store direction
                     dire = d
-        #Increment direction
-        d = d + 1
 
     rotation = 0
 
@@ -171,75 +205,41 @@ def checkForNotch (pos, walls):
     return needLeft, needRight, rotation
 
 
-def createFileData (walls, obstacles, numThermal, numVisual, startPos):
-    '''Create a file data string from the positions and scales'''
-    #Open the file containing the standard header
-    headerFile = open(os.path.join(dirname, "fileHeader.txt"), "r")
-    #Read header
-    fileHeader = headerFile.read()
-    #Close header file
-    headerFile.close()
-
-    #Open the file containing the template for a group
-    groupTemplate = open(os.path.join(dirname, "groupTemplate.txt"), "r")
-    #Read template
-    groupPart = groupTemplate.read()
-    #Close template file
-    groupTemplate.close()
-
-    #Open the file containing the template for a robot
-    robotTemplate = open(os.path.join(dirname, "robotTemplate.txt"), "r")
-    #Read template
-    robotPart = robotTemplate.read()
-    #Close template file
-    robotTemplate.close()
-
-    #Open the file containing the template for a proto tile
-    protoTileTemplate = open(os.path.join(dirname, "protoTileTemplate.txt"), "r")
-    #Read template
-    protoTilePart = protoTileTemplate.read()
-    #Close template file
-    protoTileTemplate.close()
-    
-    #Open the file containing the template for a boundary
-    boundsTemplate = open(os.path.join(dirname, "boundsTemplate.txt"), "r")
-    #Read template
-    boundsPart = boundsTemplate.read()
-    #Close template file
-    boundsTemplate.close()
-
-    #Open the file containing the template for the obstacles
-    obstacleTemplate = open(os.path.join(dirname, "obstacleTemplate.txt"), "r")
-    #Read template
-    obstaclePart = obstacleTemplate.read()
-    #Close template file
-    obstacleTemplate.close()
-
-    #Open the file containing the template for the debris
-    debrisTemplate = open(os.path.join(dirname, "debrisTemplate.txt"), "r")
-    #Read template
-    debrisPart = debrisTemplate.read()
-    #Close template file
-    debrisTemplate.close()
-    
-    #Open the file containing the template for the supervisor
-    supervisorTemplate = open(os.path.join(dirname, "supervisorTemplate.txt"), "r")
-    #Read template
-    supervisorPart = supervisorTemplate.read()
-    #Close template file
-    supervisorTemplate.close()
-
-
-    #Create file data - initialy just the header
-    fileData = fileHeader
-
-    #Strings to hold the tile parts
-    allTiles = ""
-    #Strings to hold the boundaries for special tiles
-    allCheckpointBounds = ""
-    allTrapBounds = ""
-    allGoalBounds = ""
-    allSwampBounds = ""
+def writeFileData (worldFile, walls, obstacles, numThermal, numVisual, startPos):
+    '''Write the file data from the positions and scales to an open text file (one part at a time)'''
+    #Get the standard header
+    fileHeader = loadTemplate("fileHeader.txt")
+    #Get the template for a group
+    groupPart = loadTemplate("groupTemplate.txt")
+    #Get the template for a robot
+    robotPart = loadTemplate("robotTemplate.txt")
+    #Get the template for a proto tile
+    protoTilePart = loadTemplate("protoTileTemplate.txt")
+    #Get the template for a boundary
+    boundsPart = loadTemplate("boundsTemplate.txt")
+    #Get the template for the obstacles
+    obstaclePart = loadTemplate("obstacleTemplate.txt")
+    #Get the template for the debris
+    debrisPart = loadTemplate("debrisTemplate.txt")
+    #Get the template for the supervisor
+    supervisorPart = loadTemplate("supervisorTemplate.txt")
+
+    #Format functions for the templates that are filled in once per tile or obstacle
+    formatTile = protoTilePart.format
+    formatBounds = boundsPart.format
+    formatObstacle = obstaclePart.format
+    formatDebris = debrisPart.format
+
+    #Write the file data - initialy just the header
+    worldFile.write(fileHeader)
+
+    #Lists to hold the tile parts
+    allTiles = []
+    #Lists to hold the boundaries for special tiles
+    allCheckpointBounds = []
+    allTrapBounds = []
+    allGoalBounds = []
+    allSwampBounds = []
 
     #Upper left corner to start placing tiles from
     width = len(walls[0])
@@ -247,6 +247,15 @@ def createFileData (walls, obstacles, numThermal, numVisual, startPos):
     startX = -(len(walls[0]) * 0.3 / 2.0)
     startZ = -(len(walls) * 0.3 / 2.0)
 
+    #Centre position of each column and row of tiles
+    xCentres = [x * 0.3 + startX for x in range(0, width)]
+    zCentres = [z * 0.3 + startZ for z in range(0, height)]
+    #Lower and upper edge of each column and row of tiles (for boundaries)
+    xLowers = [centre - 0.15 for centre in xCentres]
+    xUppers = [centre + 0.15 for centre in xCentres]
+    zLowers = [centre - 0.15 for centre in zCentres]
+    zUppers = [centre + 0.15 for centre in zCentres]
+
     #Id numbers used to give a unique but interable name to tile pieces
     tileId = 0
     checkId = 0
@@ -267,133 +276,128 @@ def createFileData (walls, obstacles, numThermal, numVisual, startPos):
                 notch = "left"
             if notchData[1]:
                 notch = "right"
-            #Create a new tile with all the data
-            tile = protoTilePart.format(x, z, walls[z][x][0] and not walls[z][x][3], walls[z][x][1][0], walls[z][x][1][1], walls[z][x][1][2], walls[z][x][1][3], corners[0], corners[1], corners[2], corners[3], externals[0], externals[1], externals[2], externals[3], notch, notchData[2], walls[z][x][4], walls[z][x][3], walls[z][x][2], walls[z][x][5], width, height, tileId)
-            tile = tile.replace("True", "TRUE")
-            tile = tile.replace("False", "FALSE")
-            allTiles = allTiles + tile
+            #Get the data for this tile [present, [uWall,rWall,dWall,lWall], checkpoint, trap, goal, swamp]
+            present, tileWalls, checkpoint, trap, goal, swamp = walls[z][x]
+            #Create a new tile with all the data (with true and false written in the file's form)
+            tile = formatTile(x, z, boolText[present and not trap], boolText[tileWalls[0]], boolText[tileWalls[1]], boolText[tileWalls[2]], boolText[tileWalls[3]], boolText[corners[0]], boolText[corners[1]], boolText[corners[2]], boolText[corners[3]], boolText[externals[0]], boolText[externals[1]], boolText[externals[2]], boolText[externals[3]], notch, notchData[2], boolText[goal], boolText[trap], boolText[checkpoint], boolText[swamp], width, height, tileId)
+            allTiles.append(tile)
             #checkpoint
-            if walls[z][x][2]:
+            if checkpoint:
                 #Add bounds to the checkpoint boundaries
-                allCheckpointBounds = allCheckpointBounds + boundsPart.format("checkpoint", checkId, (x * 0.3 + startX) - 0.15, (z * 0.3 + startZ) - 0.15, (x * 0.3 + startX) + 0.15, (z * 0.3 + startZ) + 0.15)
+                allCheckpointBounds.append(formatBounds("checkpoint", checkId, xLowers[x], zLowers[z], xUppers[x], zUppers[z]))
                 #Increment id counter
                 checkId = checkId + 1
                     
             #trap
-            if walls[z][x][3]:
+            if trap:
                 #Add bounds to the trap boundaries
-                allTrapBounds = allTrapBounds + boundsPart.format("trap", trapId, (x * 0.3 + startX) - 0.15, (z * 0.3 + startZ) - 0.15, (x * 0.3 + startX) + 0.15, (z * 0.3 + startZ) + 0.15)
+                allTrapBounds.append(formatBounds("trap", trapId, xLowers[x], zLowers[z], xUppers[x], zUppers[z]))
                 #Increment id counter
                 trapId = trapId + 1
                     
             #goal
-            if walls[z][x][4]:
+            if goal:
                 #Add bounds to the goal boundaries
-                allGoalBounds = allGoalBounds + boundsPart.format("start", goalId, (x * 0.3 + startX) - 0.15, (z * 0.3 + startZ) - 0.15, (x * 0.3 + startX) + 0.15, (z * 0.3 + startZ) + 0.15)
+                allGoalBounds.append(formatBounds("start", goalId, xLowers[x], zLowers[z], xUppers[x], zUppers[z]))
                 #Increment id counter
                 goalId = goalId + 1
             #swamp
-            if walls[z][x][5]:
+            if swamp:
                 #Add bounds to the swamp boundaries
-                allSwampBounds = allSwampBounds + boundsPart.format("swamp", swampId, (x * 0.3 + startX) - 0.15, (z * 0.3 + startZ) - 0.15, (x * 0.3 + startX) + 0.15, (z * 0.3 + startZ) + 0.15)
+                allSwampBounds.append(formatBounds("swamp", swampId, xLowers[x], zLowers[z], xUppers[x], zUppers[z]))
                 #Increment id counter
                 swampId = swampId + 1
             #Increment id counter
             tileId = tileId + 1
 
     #Add the data pieces to the file data
-    fileData = fileData + groupPart.format(allTiles, "WALLTILES")
-    fileData = fileData + groupPart.format(allCheckpointBounds, "CHECKPOINTBOUNDS")
-    fileData = fileData + groupPart.format(allTrapBounds, "TRAPBOUNDS")
-    fileData = fileData + groupPart.format(allGoalBounds, "STARTBOUNDS")
-    fileData = fileData + groupPart.format(allSwampBounds, "SWAMPBOUNDS")
-
-    #String to hold all the data for the obstacles
-    allObstacles = ""
-    allDebris = ""
-
-    #Id to give a unique name to the obstacles
-    obstacleId = 0
-    debrisId = 0
-
-    #Iterate obstalces
-    for obstacle in obstacles:
-        #If this is debris
-        if obstacle[3]:
-            #Add the debris object
-            allDebris = allDebris + debrisPart.format(debrisId, obstacle[0], obstacle[1], obstacle[2])
-            #Increment id counter
-            debrisId = debrisId + 1
-        else:
-            #Add the obstacle
-            allObstacles = allObstacles + obstaclePart.format(obstacleId, obstacle[0], obstacle[1], obstacle[2])
-            #Increment id counter
-            obstacleId = obstacleId + 1
+    worldFile.write(groupPart.format("".join(allTiles), "WALLTILES"))
+    worldFile.write(groupPart.format("".join(allCheckpointBounds), "CHECKPOINTBOUNDS"))
+    worldFile.write(groupPart.format("".join(allTrapBounds), "TRAPBOUNDS"))
+    worldFile.write(groupPart.format("".join(allGoalBounds), "STARTBOUNDS"))
+    worldFile.write(groupPart.format("".join(allSwampBounds), "SWAMPBOUNDS"))
+
+    #Lists to hold all the data for the obstacles
+    allObstacles = []
+    allDebris = []
+
+    #Iterate static obstacles (numbered to give a unique name)
+    for obstacleId, obstacle in enumerate([o for o in obstacles if not o[3]]):
+        #Add the obstacle
+        allObstacles.append(formatObstacle(obstacleId, obstacle[0], obstacle[1], obstacle[2]))
+
+    #Iterate debris (numbered to give a unique name)
+    for debrisId, obstacle in enumerate([o for o in obstacles if o[3]]):
+        #Add the debris object
+        allDebris.append(formatDebris(debrisId, obstacle[0], obstacle[1], obstacle[2]))
 
     #Add obstacles and debris to the file
-    fileData = fileData + groupPart.format(allObstacles, "OBSTACLES")
-    fileData = fileData + groupPart.format(allDebris, "DEBRIS")
+    worldFile.write(groupPart.format("".join(allObstacles), "OBSTACLES"))
+    worldFile.write(groupPart.format("".join(allDebris), "DEBRIS"))
     
     #String to hold all the data for the robots
     robotData = ""
-    #If starting facing up
-    if startPos[1] == 0:
-        #Add robots (spaced -X, +X) and rotated
-        robotData = robotData + robotPart.format(0, (startPos[0][0] * 0.3 + startX) - 0.075, startPos[0][1] * 0.3 + startZ, 0)
-        robotData = robotData + robotPart.format(1, (startPos[0][0] * 0.3 + startX) + 0.075, startPos[0][1] * 0.3 + startZ, 0)
-    #If starting facing right
-    if startPos[1] == 1:
-        #Add robots (spaced -Z, +Z) and rotated
-        robotData = robotData + robotPart.format(0, startPos[0][0] * 0.3 + startX, (startPos[0][1] * 0.3 + startZ) - 0.075, -1.5708)
-        robotData = robotData + robotPart.format(1, startPos[0][0] * 0.3 + startX, (startPos[0][1] * 0.3 + startZ) + 0.075, -1.5708)
-    #If starting facing down
-    if startPos[1] == 2:
-        #Add robots (spaced +X, -X) and rotated
-        robotData = robotData + robotPart.format(0, (startPos[0][0] * 0.3 + startX) + 0.075, startPos[0][1] * 0.3 + startZ, 3.14159)
-        robotData = robotData + robotPart.format(1, (startPos[0][0] * 0.3 + startX) - 0.075, startPos[0][1] * 0.3 + startZ, 3.14159)
-    #If starting facing left
-    if startPos[1] == 3:
-        #Add robots (spaced +Z, -Z) and rotated
-        robotData = robotData + robotPart.format(0, startPos[0][0] * 0.3 + startX, (startPos[0][1] * 0.3 + startZ) + 0.075, 1.5708)
-        robotData = robotData + robotPart.format(1, startPos[0][0] * 0.3 + startX, (startPos[0][1] * 0.3 + startZ) - 0.075, 1.5708)
-                                            
-    fileData = fileData + groupPart.format("", "HUMANGROUP")
+    #If there is a valid start direction
+    if startPos[1] > -1 and startPos[1] < len(robotPlacements):
+        #Get the offsets and rotation for the robots facing this way
+        offsets, rotation = robotPlacements[startPos[1]]
+        #Centre of the start tile
+        robotX = xCentres[startPos[0][0]]
+        robotZ = zCentres[startPos[0][1]]
+        #Add each robot (numbered in order)
+        robotData = "".join(robotPart.format(robotId, robotX + offset[0], robotZ + offset[1], rotation) for robotId, offset in enumerate(offsets))
+
+    worldFile.write(groupPart.format("", "HUMANGROUP"))
     
     #Add the robot data to the file
-    fileData = fileData + robotData
+    worldFile.write(robotData)
 
     #Add supervisors
-    fileData = fileData + supervisorPart
+    worldFile.write(supervisorPart)
+
+
+def createFileData (walls, obstacles, numThermal, numVisual, startPos):
+    '''Create a file data string from the positions and scales'''
+    #Write the file data to a string buffer
+    fileData = io.StringIO()
+    writeFileData(fileData, walls, obstacles, numThermal, numVisual, startPos)
     
     #Return the file data as a string
-    return fileData
+    return fileData.getvalue()
 
 
-def makeFile(boxData, obstacles, thermal, visual, startPos, uiWindow = None):
-    '''Create and save the file for the information'''
-    #Generate the file string for the map
-    data = createFileData(boxData, obstacles, thermal, visual, startPos)
+def getFilePath (uiWindow = None):
+    '''Get the path to save the world file to (asks the user if there is a GUI window)'''
     #The default file path
     filePath = os.path.join(dirname, "generatedWorld.wbt")
 
     #If there is a GUI window to use
     if uiWindow != None:
-        #Get the path from the user
-        path = uiWindow.getPathSelection()
-        #Strip leading or trailing whitespace
-        path = path.strip()
-        #If there is a path
+        #Get the path from the user (without leading or trailing whitespace)
+        path = uiWindow.getPathSelection().strip()
+        #If there is a path use it (adding the .wbt extension if it isn't there)
         if path != "":
-            #If there isn't a .wbt extension on the file
-            if not path.endswith(".wbt"):
-                #Add the extension
-                path = path + ".wbt"
-            #Change the path to the one the user gave
-            filePath = path
-
-    #Open the file to store the world in (cleared when opened)
-    worldFile = open(filePath, "w")
-    #Write all the information to the file
-    worldFile.write(data)
-    #Close the file
-    worldFile.close()
+            filePath = path if path.endswith(".wbt") else f"{path}.wbt"
+
+    return filePath
+
+
+def makeFile(boxData, obstacles, thermal, visual, startPos, uiWindow = None):
+    '''Create and save the file for the information'''
+    #Get where to save the file before generating (the dialog doesn't wait for the file data)
+    filePath = getFilePath(uiWindow)
+
+    #Write to a temporary file first so a failed generation cannot leave a partial world file at the chosen path
+    tempPath = filePath + ".tmp"
+    try:
+        #Open the temporary file with no newline translation
+        with open(tempPath, "w", encoding = "utf-8", newline = "") as worldFile:
+            #Write all the information for the map to the file
+            writeFileData(worldFile, boxData, obstacles, thermal, visual, startPos)
+        #Move the completed file into place (replacing any existing file)
+        os.replace(tempPath, filePath)
+    except:
+        #Remove the incomplete temporary file
+        if os.path.exists(tempPath):
+            os.remove(tempPath)
+        raise